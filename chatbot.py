@@ -10,6 +10,12 @@ from langchain.vectorstores import Pinecone
 from langchain.llms import OpenAI
 from langchain.chains.question_answering import load_qa_chain
 
+UPSERT_BATCH_SIZE = 100
+PINECONE_POOL_THREADS = 16
+# Pinecone caps metadata at 40 KB per vector, so documents are split before embedding
+EMBED_CHUNK_SIZE = 1000
+EMBED_CHUNK_OVERLAP = 200
+
 @click.group()
 def main():
     pass
@@ -83,26 +89,38 @@ def create_embeddings(source):
     )
 
     index_name = "chatbot-demo"
-    index = Pinecone(index_name)
+    index = pinecone.Index(index_name, pool_threads=PINECONE_POOL_THREADS)
+
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=EMBED_CHUNK_SIZE,
+                                                   chunk_overlap=EMBED_CHUNK_OVERLAP)
 
+    vectors = []
     for filename in os.listdir(source):
         if filename.endswith(".txt"):
             with open(os.path.join(source, filename), 'r') as f:
-                content = f.read()
-                # Assuming content is a string of text, you need to embed it.
-                embedding = embeddings.embed_query(content)
-                # Add the embedding to the index
-                index.upsert(str(filename), embedding)
-                
+                text = f.read()
         elif filename.endswith(".pdf"):
             with fitz.open(os.path.join(source, filename)) as doc:
                 text = ""
                 for page in doc:
                     text += page.get_text()
-                # Assuming text is a string of text, you need to embed it.
-                embedding = embeddings.embed_query(text)
-                # Add the embedding to the index
-                index.upsert(str(filename), embedding)
+        else:
+            continue
+
+        # Embed each chunk, keeping the chunk text small enough for its metadata
+        chunks = text_splitter.split_text(text)
+        if not chunks:
+            continue
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings.embed_documents(chunks))):
+            vectors.append((f"{filename}#{i}", embedding, {'text': chunk, 'source': filename}))
+
+    # Send the upserts in batches, in parallel across the index thread pool
+    requests = [
+        index.upsert(vectors=vectors[i:i + UPSERT_BATCH_SIZE], async_req=True)
+        for i in range(0, len(vectors), UPSERT_BATCH_SIZE)
+    ]
+    for request in requests:
+        request.get()
 
     print("Embeddings created and indexed in Pinecone.")
 
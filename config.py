@@ -5,6 +5,42 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+# Chatbot database schema; kept here so setup can create it without importing the chatbot
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    preferred_language TEXT DEFAULT 'en',
+    preferences TEXT DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT,
+    query TEXT,
+    response TEXT,
+    language TEXT,
+    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    query_type TEXT DEFAULT 'text',
+    FOREIGN KEY (session_id) REFERENCES users (session_id)
+);
+
+CREATE TABLE IF NOT EXISTS job_preferences (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT,
+    category TEXT,
+    keywords TEXT,
+    location TEXT,
+    experience_level TEXT,
+    FOREIGN KEY (session_id) REFERENCES users (session_id)
+);
+
+-- Indexes for the per-session lookups (users.session_id is already UNIQUE)
+CREATE INDEX IF NOT EXISTS ix_conv_sess_ts ON conversations (session_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS ix_jobpref_sess ON job_preferences (session_id);
+"""
+
 class Config:
     """Configuration class for the PGRKAM Digital Assistant"""
 
@@ -35,6 +71,7 @@ class Config:
     DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'en')
     # SUPPORTED_LANGUAGES = os.getenv('SUPPORTED_LANGUAGES', 'en,hi,pa').split(',') # Keep if using env var
     SUPPORTED_LANGUAGES = ['en', 'hi', 'pa'] # Or define directly
+    LID_MODEL_PATH = os.getenv('LID_MODEL_PATH', 'lid.176.bin') # fastText language-identification model
 
     # --- Gemini Model Settings ---
     # Use the model that worked or you intend to test
@@ -2,8 +2,16 @@ import os
 import sqlite3
 import json
 import re
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, NamedTuple, Iterator
 import logging
 
 # Core dependencies
@@ -11,14 +19,14 @@ import openai
 import pinecone
 from langchain.document_loaders import DirectoryLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.vectorstores import Pinecone
 from langchain.llms import OpenAI
 from langchain.chains.question_answering import load_qa_chain
 
 # Multilingual support
 from googletrans import Translator
 from langdetect import detect
+import fasttext
+import ahocorasick
 import unicodedata
 
 # Speech processing
@@ -26,88 +34,431 @@ import speech_recognition as sr
 import pyttsx3
 
 # Database and utilities
+import numpy as np
 import pandas as pd
-from config import Config
+from config import Config, SCHEMA_SQL
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DB_PATH = 'chatbot.db'
+READ_POOL_SIZE = os.cpu_count() or 4
+STATEMENT_CACHE_SIZE = 256
+FLUSH_BATCH_SIZE = 100
+FLUSH_INTERVAL = 0.2  # seconds
+EMBEDDING_MODEL = "text-embedding-ada-002"
+EMBED_BATCH_WINDOW = 0.05  # seconds
+EMBED_BATCH_SIZE = 1000
+RESPONSE_CACHE_SIZE = 1024
+SEMANTIC_CACHE_THRESHOLD = 0.98  # minimum cosine similarity for a semantic hit
+GENERATION_ERROR_RESPONSE = "I apologize, but I'm having trouble generating a response at the moment."
+TTS_QUEUE_SIZE = 8
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_AGGRESSIVENESS = 2
+VAD_PREROLL_FRAMES = 10    # audio kept from just before speech starts
+VAD_SILENCE_FRAMES = 10    # unvoiced frames (~300 ms) that end an utterance
+VAD_MAX_FRAMES = 500       # cap utterances at ~15 s
+JOB_KEYWORDS = ('job', 'naukri', 'ਨੌਕਰੀ', 'career', 'employment', 'vacancy')
+
+# Fixed (prefix, question label, suffix) prompt parts per language; context and query go between them
+_PROMPT_PARTS = {
+    'en': (
+        "You are a helpful assistant for the PGRKAM (Punjab Government Recruitment and Knowledge Acquisition Mission) digital platform.\n"
+        "Answer the following question based on the provided context about job search, skill development, and foreign counseling.\n\n"
+        "Context: ",
+        "\n\nQuestion: ",
+        "\n\nProvide a helpful, accurate response. If the information is not in the context, say so politely."
+    ),
+    'hi': (
+        "आप PGRKAM (पंजाब सरकार भर्ती और ज्ञान अधिग्रहण मिशन) डिजिटल प्लेटफॉर्म के लिए एक सहायक हैं।\n"
+        "नौकरी खोज, कौशल विकास और विदेशी परामर्श के बारे में प्रदान की गई जानकारी के आधार पर निम्नलिखित प्रश्न का उत्तर दें।\n\n"
+        "संदर्भ: ",
+        "\n\nप्रश्न: ",
+        "\n\nएक सहायक, सटीक प्रतिक्रिया प्रदान करें। यदि जानकारी संदर्भ में नहीं है, तो विनम्रता से कहें।"
+    ),
+    'pa': (
+        "ਤੁਸੀਂ PGRKAM (ਪੰਜਾਬ ਸਰਕਾਰ ਭਰਤੀ ਅਤੇ ਗਿਆਨ ਪ੍ਰਾਪਤੀ ਮਿਸ਼ਨ) ਡਿਜੀਟਲ ਪਲੇਟਫਾਰਮ ਲਈ ਇੱਕ ਸਹਾਇਕ ਹੋ।\n"
+        "ਨੌਕਰੀ ਖੋਜ, ਹੁਨਰ ਵਿਕਾਸ ਅਤੇ ਵਿਦੇਸ਼ੀ ਸਲਾਹ ਮਸ਼ਵਰੇ ਬਾਰੇ ਪ੍ਰਦਾਨ ਕੀਤੀ ਗਈ ਜਾਣਕਾਰੀ ਦੇ ਆਧਾਰ 'ਤੇ ਹੇਠਾਂ ਦਿੱਤੇ ਸਵਾਲ ਦਾ ਜਵਾਬ ਦਿਓ।\n\n"
+        "ਸੰਦਰਭ: ",
+        "\n\nਸਵਾਲ: ",
+        "\n\nਇੱਕ ਸਹਾਇਕ, ਸਹੀ ਜਵਾਬ ਪ੍ਰਦਾਨ ਕਰੋ। ਜੇ ਜਾਣਕਾਰੀ ਸੰਦਰਭ ਵਿੱਚ ਨਹੀਂ ਹੈ, ਤਾਂ ਨਮਰਤਾ ਨਾਲ ਕਹੋ।"
+    ),
+}
+
+def _fasttext_top_label(model, text: str) -> Optional[str]:
+    """Return the most likely language code for one line of text, or None"""
+    # Written against fasttext 0.9.2/0.9.3 (pinned <0.10 in requirement.txt): their
+    # FastText.predict wraps the result in np.array(..., copy=False), which raises under
+    # NumPy 2, so call the native predictor it wraps. Recheck this on a fastText upgrade.
+    predictions = model.f.predict(text.replace('\n', ' '), 1, 0.0, 'strict')
+    if not predictions:
+        return None
+    return predictions[0][1].replace('__label__', '')
+
+def _write_conversations(conn: sqlite3.Connection, lock: threading.Lock, sql: str,
+                         rows: List[Tuple]):
+    """Insert a batch of conversations in a single transaction"""
+    try:
+        with lock, conn:
+            conn.executemany(sql, rows)
+    except Exception as e:
+        logger.error(f"Database save error: {e}")
+
+def _flush_loop(log_queue: queue.Queue, conn: sqlite3.Connection, lock: threading.Lock, sql: str):
+    """Collect queued conversations for up to FLUSH_INTERVAL and commit them together"""
+    # Rows are tuples; an Event is a flush marker, set once everything queued before
+    # it is committed; None commits what is left and stops the loop
+    while True:
+        rows = []
+        item = log_queue.get()
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while isinstance(item, tuple):
+            rows.append(item)
+            if len(rows) >= FLUSH_BATCH_SIZE:
+                break
+            try:
+                item = log_queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+        
+        if rows:
+            _write_conversations(conn, lock, sql, rows)
+        if isinstance(item, threading.Event):
+            item.set()
+        elif item is None:
+            return
+
+def _stop_flusher(log_queue: queue.Queue, flusher: threading.Thread):
+    """Drain the conversation queue and wait for its flusher to exit"""
+    log_queue.put(None)
+    flusher.join()
+
+class RetrievedDocument(NamedTuple):
+    """A vector-search match, exposing page_content like a LangChain Document"""
+    page_content: str
+    score: float
+    metadata: Dict
+
+class ResponseCache:
+    """Two-tier cache of generated responses: exact query text, then embedding similarity"""
+    
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._exact = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Semantic tier: a ring buffer of unit-normalized float32 embeddings, so one
+        # matrix-vector product gives the cosine against every entry (6 KB per 1536-dim slot)
+        self._vectors = None  # (maxsize, dim) float32, allocated on the first insert
+        self._lang_ids = np.full(maxsize, -1, dtype=np.int16)
+        self._languages = {}
+        self._responses = [None] * maxsize
+        self._next_slot = 0
+        self._count = 0
+    
+    def _lookup(self, table: OrderedDict, key):
+        """Return a cached value and mark it most recently used"""
+        if key not in table:
+            return None
+        table.move_to_end(key)
+        return table[key]
+    
+    def _store(self, table: OrderedDict, key, value):
+        """Insert a value, evicting the least recently used entry when full"""
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.maxsize:
+            table.popitem(last=False)
+    
+    def get_exact(self, language: str, query: str) -> Optional[str]:
+        """Return the cached response for exactly this query text"""
+        with self._lock:
+            return self._lookup(self._exact, (language, query))
+    
+    def get_similar(self, language: str, query_vec: List[float]) -> Optional[str]:
+        """Return the cached response whose embedding is closest to the query, if close enough"""
+        vec = np.asarray(query_vec, dtype=np.float32)
+        query_norm = float(np.linalg.norm(vec))
+        with self._lock:
+            lang_id = self._languages.get(language)
+            if lang_id is None or not self._count or not query_norm:
+                return None
+            
+            # Cosine against every cached vector in one pass
+            n = self._count
+            scores = self._vectors[:n] @ (vec / query_norm)
+            scores[self._lang_ids[:n] != lang_id] = -np.inf
+            best = int(np.argmax(scores))
+            return self._responses[best] if scores[best] >= self.threshold else None
+    
+    def put(self, language: str, query: str, query_vec: Optional[List[float]], response: str):
+        """Cache a response under its query text and, if available, its embedding"""
+        with self._lock:
+            self._store(self._exact, (language, query), response)
+            if query_vec is None:
+                return
+            
+            vec = np.asarray(query_vec, dtype=np.float32)
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, vec.shape[0]), dtype=np.float32)
+            slot = self._next_slot
+            self._vectors[slot] = vec / (np.linalg.norm(vec) or 1.0)
+            self._lang_ids[slot] = self._languages.setdefault(language, len(self._languages))
+            self._responses[slot] = response
+            self._next_slot = (slot + 1) % self.maxsize
+            self._count = min(self._count + 1, self.maxsize)
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embedding requests into a single OpenAI call"""
+    
+    def __init__(self, model: str = EMBEDDING_MODEL, window: float = EMBED_BATCH_WINDOW,
+                 max_batch: int = EMBED_BATCH_SIZE):
+        self.model = model
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def embed(self, text: str) -> List[float]:
+        """Embed one text, blocking until its batch has been sent"""
+        return self.embed_many([text])[0]
+    
+    def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts; they are queued together so they share a batch"""
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return [future.result() for future in futures]
+    
+    def _run(self):
+        """Collect requests for one window and embed them in one request"""
+        while True:
+            pending = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(pending) < self.max_batch:
+                try:
+                    pending.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            
+            try:
+                response = openai.Embedding.create(
+                    input=[text for text, _ in pending],
+                    model=self.model
+                )
+                for item in response['data']:
+                    pending[item['index']][1].set_result(item['embedding'])
+            except Exception as e:
+                logger.error(f"Embedding batch error: {e}")
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
 class MultilingualChatbot:
     """Enhanced multilingual chatbot for PGRKAM digital platform"""
     
+    _PUNCT_RE = re.compile(r'[^\w\s]')
+    
+    # Hot-path statements; fixed text keeps them in each connection's statement cache
+    SQL = {
+        'insert_conv': '''
+            INSERT INTO conversations (session_id, query, response, language, query_type)
+            VALUES (?, ?, ?, ?, ?)
+        ''',
+        'get_prefs': 'SELECT preferences FROM users WHERE session_id = ?',
+        'set_prefs': '''
+            INSERT INTO users (session_id, preferences)
+            VALUES (?, ?)
+            ON CONFLICT (session_id) DO UPDATE SET preferences = excluded.preferences
+        ''',
+        'get_history': '''
+            SELECT query, response, language, timestamp, query_type
+            FROM conversations 
+            WHERE session_id = ? 
+            ORDER BY timestamp DESC 
+            LIMIT ?
+        ''',
+    }
+    
     def __init__(self):
         self.config = Config()
         self.translator = Translator()
-        self.recognizer = sr.Recognizer()
-        self.tts_engine = pyttsx3.init()
-        self.setup_tts()
-        self.setup_database()
-        self.setup_vector_store()
+        self.setup_keyword_matcher()
+        self._tts_lock = threading.Lock()
+        self._tts_q = None
         
-    def setup_tts(self):
+        # Independent of the vector store, so it works even if Pinecone setup fails
+        self._response_cache = ResponseCache()
+        self._embedder = None
+        self._pc_index = None
+        
+        # The remaining setup steps touch disjoint state, so run them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self.setup_language_detector),
+                executor.submit(self.setup_database),
+                executor.submit(self.setup_vector_store),
+            ]
+            for future in futures:
+                future.result()
+        
+        self.setup_conversation_logger()
+        
+    def setup_language_detector(self):
+        """Load the fastText language-identification model once"""
+        try:
+            self._lid = fasttext.load_model(self.config.LID_MODEL_PATH)
+            logger.info("Language identification model loaded")
+        except Exception as e:
+            # Optional download (see README); langdetect covers detection without it
+            logger.warning(f"Language model unavailable, falling back to langdetect: {e}")
+            self._lid = None
+    
+    def setup_keyword_matcher(self):
+        """Build an Aho-Corasick automaton so job keywords match in one pass"""
+        self._job_ac = ahocorasick.Automaton()
+        for keyword in JOB_KEYWORDS:
+            self._job_ac.add_word(keyword.lower(), keyword)
+        self._job_ac.make_automaton()
+    
+    @cached_property
+    def tts_engine(self):
+        """Text-to-speech engine, created on first use so text-only sessions never load it"""
+        engine = pyttsx3.init()
+        self._configure_tts(engine)
+        return engine
+    
+    @cached_property
+    def recognizer(self) -> sr.Recognizer:
+        """Speech recognizer, created on first voice input"""
+        return sr.Recognizer()
+    
+    @cached_property
+    def _vad(self):
+        """Voice activity detector for end-pointing microphone input, created on first recording"""
+        import webrtcvad
+        return webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    
+    def _configure_tts(self, engine):
         """Configure text-to-speech engine"""
-        self.tts_engine.setProperty('rate', self.config.SPEECH_RATE)
-        self.tts_engine.setProperty('volume', self.config.SPEECH_VOLUME)
+        engine.setProperty('rate', self.config.SPEECH_RATE)
+        engine.setProperty('volume', self.config.SPEECH_VOLUME)
         
         # Try to set voice gender
-        voices = self.tts_engine.getProperty('voices')
+        voices = engine.getProperty('voices')
         if voices:
             if self.config.VOICE_GENDER.lower() == 'female':
                 for voice in voices:
                     if 'female' in voice.name.lower() or 'woman' in voice.name.lower():
-                        self.tts_engine.setProperty('voice', voice.id)
+                        engine.setProperty('voice', voice.id)
                         break
             else:
                 for voice in voices:
                     if 'male' in voice.name.lower() or 'man' in voice.name.lower():
-                        self.tts_engine.setProperty('voice', voice.id)
+                        engine.setProperty('voice', voice.id)
                         break
     
+    def _speech_queue(self) -> queue.Queue:
+        """Return the TTS queue, starting the worker thread on first use"""
+        with self._tts_lock:
+            if self._tts_q is None:
+                # Speak on a worker thread so callers don't block for the audio duration
+                self._tts_q = queue.Queue(maxsize=TTS_QUEUE_SIZE)
+                self._tts_thread = threading.Thread(target=self._tts_loop, daemon=True)
+                self._tts_thread.start()
+            return self._tts_q
+    
+    def _tts_loop(self):
+        """Speak queued text one utterance at a time"""
+        while True:
+            text, done = self._tts_q.get()
+            try:
+                self.tts_engine.say(text)
+                self.tts_engine.runAndWait()
+            except Exception as e:
+                logger.error(f"Text-to-speech error: {e}")
+            finally:
+                if done is not None:
+                    done.set()
+    
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Apply the connection-level PRAGMAs shared by the writer and readers"""
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+    
     def setup_database(self):
         """Initialize SQLite database for user history and preferences"""
-        self.conn = sqlite3.connect('chatbot.db')
-        cursor = self.conn.cursor()
+        # Single writer; BEGIN IMMEDIATE takes the write lock up front
+        self._write_conn = sqlite3.connect(
+            f'file:{DB_PATH}?mode=rwc', uri=True,
+            isolation_level='IMMEDIATE', check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        # WAL lets the read-only pool proceed while a write is in flight
+        self._write_conn.execute('PRAGMA journal_mode=WAL')
+        self._apply_pragmas(self._write_conn)
+        self._write_conn.executescript(SCHEMA_SQL)
         
-        # Create tables
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT UNIQUE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                preferred_language TEXT DEFAULT 'en',
-                preferences TEXT DEFAULT '{}'
+        # Read-only pool for history and preference lookups
+        self._read_pool = queue.Queue()
+        for _ in range(READ_POOL_SIZE):
+            conn = sqlite3.connect(
+                f'file:{DB_PATH}?mode=ro', uri=True, check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
             )
-        ''')
+            conn.row_factory = sqlite3.Row
+            self._apply_pragmas(conn)
+            self._read_pool.put(conn)
         
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT,
-                query TEXT,
-                response TEXT,
-                language TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                query_type TEXT DEFAULT 'text',
-                FOREIGN KEY (session_id) REFERENCES users (session_id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS job_preferences (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT,
-                category TEXT,
-                keywords TEXT,
-                location TEXT,
-                experience_level TEXT,
-                FOREIGN KEY (session_id) REFERENCES users (session_id)
-            )
-        ''')
-        
-        self.conn.commit()
         logger.info("Database initialized successfully")
     
+    def setup_conversation_logger(self):
+        """Start the background thread that batches conversation inserts"""
+        self._write_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._log_queue = queue.Queue()
+        # The flusher holds the connection, not the chatbot, so an unused chatbot can
+        # still be collected; the finalizer drains the queue then or at interpreter exit
+        flusher = threading.Thread(
+            target=_flush_loop,
+            args=(self._log_queue, self._write_conn, self._write_lock, self.SQL['insert_conv']),
+            daemon=True
+        )
+        flusher.start()
+        self._flusher = flusher
+        self._stop_flusher = weakref.finalize(self, _stop_flusher, self._log_queue, flusher)
+    
+    def flush_conversations(self):
+        """Block until every conversation queued so far is committed"""
+        with self._log_lock:
+            if not self._stop_flusher.alive:
+                return
+            done = threading.Event()
+            self._log_queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Commit queued conversations and stop the background flusher"""
+        with self._log_lock:
+            self._stop_flusher()
+    
+    @contextmanager
+    def _read_conn(self):
+        """Borrow a read-only connection from the pool"""
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+    
     def setup_vector_store(self):
         """Initialize Pinecone vector store for RAG"""
         try:
@@ -117,12 +468,13 @@ class MultilingualChatbot:
                 environment=self.config.PINECONE_ENVIRONMENT
             )
             
-            self.embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
+            self._embedder = EmbeddingBatcher()
             self.llm = OpenAI(model_name="gpt-3.5-turbo", temperature=0.7)
             self.qa_chain = load_qa_chain(self.llm, chain_type="stuff")
             
             self.index_name = "pgrkam-chatbot"
-            self.index = Pinecone(self.index_name)
+            # Raw client index; queries return matches with their metadata directly
+            self._pc_index = pinecone.Index(self.index_name)
             
             logger.info("Vector store initialized successfully")
         except Exception as e:
@@ -132,11 +484,18 @@ class MultilingualChatbot:
         """Detect the language of input text"""
         try:
             # Remove special characters and normalize
-            clean_text = re.sub(r'[^\w\s]', '', text)
+            clean_text = self._PUNCT_RE.sub('', text)
             if len(clean_text) < 3:
                 return self.config.DEFAULT_LANGUAGE
                 
-            detected = detect(clean_text)
+            detected = None
+            if self._lid is not None:
+                try:
+                    detected = _fasttext_top_label(self._lid, clean_text)
+                except Exception as e:
+                    logger.warning(f"fastText prediction failed, using langdetect: {e}")
+            if detected is None:
+                detected = detect(clean_text)
             
             # Map detected language to supported languages
             if detected in ['hi', 'pa']:
@@ -162,14 +521,55 @@ class MultilingualChatbot:
             logger.error(f"Translation error: {e}")
             return text
     
+    def record_utterance(self, timeout: float = 5) -> sr.AudioData:
+        """Record one utterance from the microphone, end-pointed with voice activity detection"""
+        frame_size = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000
+        max_wait_frames = int(timeout * 1000 / VAD_FRAME_MS)
+        
+        # PortAudio is only needed for voice input, so text-only deployments can omit it
+        import pyaudio
+        vad = self._vad
+        audio = pyaudio.PyAudio()
+        stream = audio.open(format=pyaudio.paInt16, channels=1, rate=VAD_SAMPLE_RATE,
+                            input=True, frames_per_buffer=frame_size)
+        try:
+            preroll = deque(maxlen=VAD_PREROLL_FRAMES)
+            voiced = []
+            silent_frames = 0
+            waited_frames = 0
+            
+            while len(voiced) < VAD_MAX_FRAMES:
+                frame = stream.read(frame_size, exception_on_overflow=False)
+                is_speech = vad.is_speech(frame, VAD_SAMPLE_RATE)
+                
+                if not voiced:
+                    # Still waiting for speech to start
+                    preroll.append(frame)
+                    if is_speech:
+                        voiced.extend(preroll)
+                        continue
+                    waited_frames += 1
+                    if waited_frames >= max_wait_frames:
+                        raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                    continue
+                
+                voiced.append(frame)
+                silent_frames = 0 if is_speech else silent_frames + 1
+                if silent_frames >= VAD_SILENCE_FRAMES:
+                    break
+        finally:
+            stream.stop_stream()
+            stream.close()
+            audio.terminate()
+        
+        return sr.AudioData(b''.join(voiced), VAD_SAMPLE_RATE, 2)
+    
     def process_voice_input(self, language: str = 'en') -> str:
         """Process voice input using speech recognition"""
         try:
-            with sr.Microphone() as source:
-                print("Listening...")
-                self.recognizer.adjust_for_ambient_noise(source)
-                audio = self.recognizer.listen(source, timeout=5)
-                
+            print("Listening...")
+            audio = self.record_utterance(timeout=5)
+            
             # Use appropriate language for recognition
             lang_codes = {
                 'en': 'en-US',
@@ -189,104 +589,127 @@ class MultilingualChatbot:
             logger.error(f"Voice recognition error: {e}")
             return "Voice recognition failed"
     
-    def speak_text(self, text: str):
-        """Convert text to speech"""
+    def speak_text(self, text: str, wait: bool = False):
+        """Queue text to be spoken by the text-to-speech worker; with wait=True, block until spoken"""
+        if wait:
+            # Still spoken on the worker thread, which owns the engine
+            done = threading.Event()
+            self._speech_queue().put((text, done))
+            done.wait()
+            return
+        try:
+            self._speech_queue().put_nowait((text, None))
+        except queue.Full:
+            logger.warning("Text-to-speech queue full, dropping utterance")
+    
+    def embed_query(self, query: str) -> Optional[List[float]]:
+        """Embed a query through the batcher, returning None on failure"""
+        if self._embedder is None:
+            return None
         try:
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            return self._embedder.embed(query)
         except Exception as e:
-            logger.error(f"Text-to-speech error: {e}")
+            logger.error(f"Query embedding error: {e}")
+            return None
     
-    def get_similar_documents(self, query: str, k: int = None) -> List:
+    @staticmethod
+    def _to_documents(matches: List) -> List[RetrievedDocument]:
+        """Wrap Pinecone matches so callers can read .page_content"""
+        return [
+            RetrievedDocument(
+                page_content=(match.metadata or {}).get('text', ''),
+                score=match.score,
+                metadata=match.metadata or {}
+            )
+            for match in matches
+        ]
+    
+    def get_similar_documents(self, query: str, k: int = None,
+                              query_vec: Optional[List[float]] = None) -> List:
         """Retrieve similar documents using vector search"""
         if k is None:
             k = self.config.TOP_K_RESULTS
+        if self._pc_index is None or (query_vec is None and self._embedder is None):
+            # Vector store unavailable; answer without retrieved context
+            return []
             
         try:
-            similar_docs = self.index.similarity_search(query, k=k)
-            return similar_docs
+            if query_vec is None:
+                query_vec = self._embedder.embed(query)
+            res = self._pc_index.query(vector=query_vec, top_k=k, include_metadata=True)
+            return self._to_documents(res.matches)
         except Exception as e:
             logger.error(f"Vector search error: {e}")
             return []
     
-    def generate_response(self, query: str, context_docs: List, language: str) -> str:
-        """Generate response using LLM with context"""
+    def stream_response(self, query: str, context_docs: List, language: str) -> Iterator[str]:
+        """Stream the LLM response for a query, yielding text as it is generated"""
+        # Create context from retrieved documents
+        context = "\n".join([doc.page_content for doc in context_docs])
+        
+        # Assemble the language-specific prompt from its fixed parts
+        parts = _PROMPT_PARTS.get(language, _PROMPT_PARTS['en'])
+        prompt = parts[0] + context + parts[1] + query + parts[2]
+        
+        # Generate response using OpenAI
+        for chunk in openai.ChatCompletion.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": query}
+            ],
+            max_tokens=500,
+            temperature=0.7,
+            stream=True
+        ):
+            content = chunk.choices[0].delta.get('content')
+            if content:
+                yield content
+    
+    def stream_cached_response(self, query: str, language: str) -> Iterator[str]:
+        """Answer from the response cache, falling back to retrieval and streamed generation"""
+        response = self._response_cache.get_exact(language, query)
+        if response is not None:
+            yield response
+            return
+        
+        query_vec = self.embed_query(query)
+        if query_vec is not None:
+            response = self._response_cache.get_similar(language, query_vec)
+            if response is not None:
+                yield response
+                return
+        
+        context_docs = self.get_similar_documents(query, query_vec=query_vec)
+        chunks = []
         try:
-            # Create context from retrieved documents
-            context = "\n".join([doc.page_content for doc in context_docs])
-            
-            # Create language-specific prompt
-            prompts = {
-                'en': f"""
-                You are a helpful assistant for the PGRKAM (Punjab Government Recruitment and Knowledge Acquisition Mission) digital platform. 
-                Answer the following question based on the provided context about job search, skill development, and foreign counseling.
-                
-                Context: {context}
-                
-                Question: {query}
-                
-                Provide a helpful, accurate response. If the information is not in the context, say so politely.
-                """,
-                'hi': f"""
-                आप PGRKAM (पंजाब सरकार भर्ती और ज्ञान अधिग्रहण मिशन) डिजिटल प्लेटफॉर्म के लिए एक सहायक हैं।
-                नौकरी खोज, कौशल विकास और विदेशी परामर्श के बारे में प्रदान की गई जानकारी के आधार पर निम्नलिखित प्रश्न का उत्तर दें।
-                
-                संदर्भ: {context}
-                
-                प्रश्न: {query}
-                
-                एक सहायक, सटीक प्रतिक्रिया प्रदान करें। यदि जानकारी संदर्भ में नहीं है, तो विनम्रता से कहें।
-                """,
-                'pa': f"""
-                ਤੁਸੀਂ PGRKAM (ਪੰਜਾਬ ਸਰਕਾਰ ਭਰਤੀ ਅਤੇ ਗਿਆਨ ਪ੍ਰਾਪਤੀ ਮਿਸ਼ਨ) ਡਿਜੀਟਲ ਪਲੇਟਫਾਰਮ ਲਈ ਇੱਕ ਸਹਾਇਕ ਹੋ।
-                ਨੌਕਰੀ ਖੋਜ, ਹੁਨਰ ਵਿਕਾਸ ਅਤੇ ਵਿਦੇਸ਼ੀ ਸਲਾਹ ਮਸ਼ਵਰੇ ਬਾਰੇ ਪ੍ਰਦਾਨ ਕੀਤੀ ਗਈ ਜਾਣਕਾਰੀ ਦੇ ਆਧਾਰ 'ਤੇ ਹੇਠਾਂ ਦਿੱਤੇ ਸਵਾਲ ਦਾ ਜਵਾਬ ਦਿਓ।
-                
-                ਸੰਦਰਭ: {context}
-                
-                ਸਵਾਲ: {query}
-                
-                ਇੱਕ ਸਹਾਇਕ, ਸਹੀ ਜਵਾਬ ਪ੍ਰਦਾਨ ਕਰੋ। ਜੇ ਜਾਣਕਾਰੀ ਸੰਦਰਭ ਵਿੱਚ ਨਹੀਂ ਹੈ, ਤਾਂ ਨਮਰਤਾ ਨਾਲ ਕਹੋ।
-                """
-            }
-            
-            prompt = prompts.get(language, prompts['en'])
-            
-            # Generate response using OpenAI
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": query}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content.strip()
-            
+            for chunk in self.stream_response(query, context_docs, language):
+                chunks.append(chunk)
+                yield chunk
         except Exception as e:
             logger.error(f"Response generation error: {e}")
-            return "I apologize, but I'm having trouble generating a response at the moment."
+            if not chunks:
+                yield GENERATION_ERROR_RESPONSE
+            return
+        
+        self._response_cache.put(language, query, query_vec, "".join(chunks))
     
     def save_conversation(self, session_id: str, query: str, response: str, 
                          language: str, query_type: str = 'text'):
-        """Save conversation to database"""
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT INTO conversations (session_id, query, response, language, query_type)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (session_id, query, response, language, query_type))
-            self.conn.commit()
-        except Exception as e:
-            logger.error(f"Database save error: {e}")
+        """Queue conversation for the background flusher to save"""
+        row = (session_id, query, response, language, query_type)
+        with self._log_lock:
+            if self._stop_flusher.alive:
+                self._log_queue.put(row)
+                return
+        logger.warning("Conversation logger is closed; saving conversation synchronously")
+        _write_conversations(self._write_conn, self._write_lock, self.SQL['insert_conv'], [row])
     
     def get_user_preferences(self, session_id: str) -> Dict:
         """Get user preferences from database"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT preferences FROM users WHERE session_id = ?', (session_id,))
-            result = cursor.fetchone()
+            with self._read_conn() as conn:
+                result = conn.execute(self.SQL['get_prefs'], (session_id,)).fetchone()
             
             if result:
                 return json.loads(result[0])
@@ -298,12 +721,10 @@ class MultilingualChatbot:
     def update_user_preferences(self, session_id: str, preferences: Dict):
         """Update user preferences in database"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO users (session_id, preferences)
-                VALUES (?, ?)
-            ''', (session_id, json.dumps(preferences)))
-            self.conn.commit()
+            with self._write_lock, self._write_conn:
+                self._write_conn.execute(
+                    self.SQL['set_prefs'], (session_id, json.dumps(preferences))
+                )
         except Exception as e:
             logger.error(f"Error updating preferences: {e}")
     
@@ -354,43 +775,64 @@ class MultilingualChatbot:
             logger.error(f"Job recommendation error: {e}")
             return []
     
+    def _prepare_query(self, query: str, session_id: str, language: Optional[str]) -> str:
+        """Resolve the query language and make sure the session has preferences"""
+        # Detect language if not provided
+        if not language:
+            language = self.detect_language(query)
+        
+        # Get or create user preferences
+        preferences = self.get_user_preferences(session_id)
+        if not preferences:
+            preferences = {
+                'preferred_language': language,
+                'preferred_category': None,
+                'experience_level': None
+            }
+            self.update_user_preferences(session_id, preferences)
+        
+        return language
+    
+    def _stream_turn(self, query: str, session_id: str, language: str,
+                     input_type: str) -> Iterator[str]:
+        """Yield the response for one turn, then save the full text"""
+        chunks = []
+        # Generate response (cached responses skip retrieval and the LLM call)
+        for chunk in self.stream_cached_response(query, language):
+            chunks.append(chunk)
+            yield chunk
+        
+        # Check if query is about jobs and provide recommendations
+        if next(self._job_ac.iter(query.lower()), None) is not None:
+            job_recommendations = self.recommend_jobs(session_id, query)
+            if job_recommendations:
+                recommendations = "\n\nJob Recommendations:\n"
+                for i, job in enumerate(job_recommendations, 1):
+                    recommendations += f"{i}. {job['title']} at {job['company']}\n"
+                    recommendations += f"   Location: {job['location']}\n"
+                    recommendations += f"   Experience: {job['experience']}\n\n"
+                chunks.append(recommendations)
+                yield recommendations
+        
+        # Save conversation once the whole response is known
+        self.save_conversation(session_id, query, "".join(chunks), language, input_type)
+    
+    def stream_query(self, query: str, session_id: str = 'default', 
+                     language: str = None, input_type: str = 'text') -> Iterator[str]:
+        """Process a user query, yielding the response text as it is generated"""
+        try:
+            language = self._prepare_query(query, session_id, language)
+            yield from self._stream_turn(query, session_id, language, input_type)
+        except Exception as e:
+            logger.error(f"Query processing error: {e}")
+            yield "I apologize, but I encountered an error processing your request."
+    
     def process_query(self, query: str, session_id: str = 'default', 
                      language: str = None, input_type: str = 'text') -> Dict:
         """Main method to process user queries"""
         try:
-            # Detect language if not provided
-            if not language:
-                language = self.detect_language(query)
-            
-            # Get or create user preferences
-            preferences = self.get_user_preferences(session_id)
-            if not preferences:
-                preferences = {
-                    'preferred_language': language,
-                    'preferred_category': None,
-                    'experience_level': None
-                }
-                self.update_user_preferences(session_id, preferences)
-            
-            # Get similar documents for context
-            context_docs = self.get_similar_documents(query)
-            
-            # Generate response
-            response = self.generate_response(query, context_docs, language)
-            
-            # Check if query is about jobs and provide recommendations
-            job_keywords = ['job', 'naukri', 'ਨੌਕਰੀ', 'career', 'employment', 'vacancy']
-            if any(keyword in query.lower() for keyword in job_keywords):
-                job_recommendations = self.recommend_jobs(session_id, query)
-                if job_recommendations:
-                    response += "\n\nJob Recommendations:\n"
-                    for i, job in enumerate(job_recommendations, 1):
-                        response += f"{i}. {job['title']} at {job['company']}\n"
-                        response += f"   Location: {job['location']}\n"
-                        response += f"   Experience: {job['experience']}\n\n"
-            
-            # Save conversation
-            self.save_conversation(session_id, query, response, language, input_type)
+            language = self._prepare_query(query, session_id, language)
+            response = "".join(self._stream_turn(query, session_id, language, input_type))
             
             return {
                 'response': response,
@@ -414,26 +856,9 @@ class MultilingualChatbot:
     def get_conversation_history(self, session_id: str, limit: int = 10) -> List[Dict]:
         """Get conversation history for a session"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                SELECT query, response, language, timestamp, query_type
-                FROM conversations 
-                WHERE session_id = ? 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            ''', (session_id, limit))
-            
-            history = []
-            for row in cursor.fetchall():
-                history.append({
-                    'query': row[0],
-                    'response': row[1],
-                    'language': row[2],
-                    'timestamp': row[3],
-                    'query_type': row[4]
-                })
-            
-            return history
+            with self._read_conn() as conn:
+                rows = conn.execute(self.SQL['get_history'], (session_id, limit))
+                return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting conversation history: {e}")
             return []
@@ -470,5 +895,7 @@ if __name__ == "__main__":
                 print(f"Response: {conv['response'][:100]}...")
                 print("-" * 40)
         else:
-            result = chatbot.process_query(user_input, session_id)
-            print(f"Assistant: {result['response']}")
+            print("Assistant: ", end="", flush=True)
+            for chunk in chatbot.stream_query(user_input, session_id):
+                print(chunk, end="", flush=True)
+            print()
@@ -1,44 +1,291 @@
-import pyautogui
-import pyperclip
+import os
+import sys
+import json
+import ctypes
+import atexit
+import hashlib
+import multiprocessing
+import queue
 import time
 import threading
-from typing import Optional, Callable
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Callable, List, Tuple, TYPE_CHECKING
 import logging
 
-from multilingual_chatbot import MultilingualChatbot
 from config import Config
 
+if TYPE_CHECKING:
+    from multilingual_chatbot import MultilingualChatbot
+
 logger = logging.getLogger(__name__)
 
+OCR_LANGUAGES = 'eng+hin+pan'
+OCR_CACHE_SIZE = 512
+OCR_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_cache.json')
+OCR_POOL_CHUNKSIZE = 4
+CLIPBOARD_POLL_INTERVAL = 0.05  # seconds between change-counter checks
+COPY_WAIT_STEP = 0.001          # poll step while waiting for Ctrl+C to land
+COPY_WAIT_TIMEOUT = 0.2         # give up on the copy after this long (sleep granularity varies by OS)
+COPY_WAIT_FALLBACK = 0.5        # fixed wait where there is no change counter
+SPEECH_QUEUE_SIZE = 2           # pending utterances; older ones are dropped first
+
+# Read-only tables shared by every ScreenReader; accessors return them without copying
+_SHORTCUTS = MappingProxyType({
+    "Ctrl+Shift+R": "Start/Stop screen reading",
+    "Ctrl+Shift+T": "Read selected text",
+    "Ctrl+Shift+S": "Speak current screen",
+    "Ctrl+Shift+H": "Read help information",
+    "Ctrl+Shift+L": "Change language",
+    "Ctrl+Shift+P": "Read preferences"
+})
+
+_HELP_TEXT = MappingProxyType({
+    'en': """
+            PGRKAM Digital Assistant - Accessibility Features:
+            
+            1. Screen Reading: Use Ctrl+Shift+R to start/stop continuous screen reading
+            2. Text Selection: Use Ctrl+Shift+T to read currently selected text
+            3. Voice Input: Use the voice input feature for hands-free interaction
+            4. Language Support: Switch between English, Hindi, and Punjabi
+            5. Keyboard Navigation: Use Tab and arrow keys to navigate
+            
+            For more help, contact support@pgrkam.gov.in
+            """,
+    'hi': """
+            PGRKAM डिजिटल असिस्टेंट - पहुंच योग्यता सुविधाएं:
+            
+            1. स्क्रीन रीडिंग: निरंतर स्क्रीन रीडिंग शुरू/बंद करने के लिए Ctrl+Shift+R का उपयोग करें
+            2. टेक्स्ट चयन: वर्तमान में चयनित टेक्स्ट पढ़ने के लिए Ctrl+Shift+T का उपयोग करें
+            3. वॉयस इनपुट: हाथ मुक्त बातचीत के लिए वॉयस इनपुट सुविधा का उपयोग करें
+            4. भाषा समर्थन: अंग्रेजी, हिंदी और पंजाबी के बीच स्विच करें
+            5. कीबोर्ड नेविगेशन: नेविगेट करने के लिए Tab और एरो की का उपयोग करें
+            
+            अधिक सहायता के लिए support@pgrkam.gov.in पर संपर्क करें
+            """,
+    'pa': """
+            PGRKAM ਡਿਜੀਟਲ ਅਸਿਸਟੈਂਟ - ਪਹੁੰਚ ਯੋਗਤਾ ਸੁਵਿਧਾਵਾਂ:
+            
+            1. ਸਕਰੀਨ ਰੀਡਿੰਗ: ਲਗਾਤਾਰ ਸਕਰੀਨ ਰੀਡਿੰਗ ਸ਼ੁਰੂ/ਬੰਦ ਕਰਨ ਲਈ Ctrl+Shift+R ਵਰਤੋਂ
+            2. ਟੈਕਸਟ ਚੋਣ: ਮੌਜੂਦਾ ਚੁਣੇ ਗਏ ਟੈਕਸਟ ਪੜ੍ਹਨ ਲਈ Ctrl+Shift+T ਵਰਤੋਂ
+            3. ਵੌਇਸ ਇਨਪੁਟ: ਹੱਥ-ਮੁਕਤ ਗੱਲਬਾਤ ਲਈ ਵੌਇਸ ਇਨਪੁਟ ਸੁਵਿਧਾ ਵਰਤੋਂ
+            4. ਭਾਸ਼ਾ ਸਹਾਇਤਾ: ਅੰਗਰੇਜ਼ੀ, ਹਿੰਦੀ ਅਤੇ ਪੰਜਾਬੀ ਵਿਚਕਾਰ ਬਦਲੋ
+            5. ਕੀਬੋਰਡ ਨੈਵੀਗੇਸ਼ਨ: ਨੈਵੀਗੇਟ ਕਰਨ ਲਈ Tab ਅਤੇ ਐਰੋ ਕੀਜ਼ ਵਰਤੋਂ
+            
+            ਹੋਰ ਸਹਾਇਤਾ ਲਈ support@pgrkam.gov.in 'ਤੇ ਸੰਪਰਕ ਕਰੋ
+            """
+})
+
+_WELCOME_MESSAGES = MappingProxyType({
+    'en': "Accessibility features are now enabled. Use keyboard shortcuts for screen reading.",
+    'hi': "पहुंच योग्यता सुविधाएं अब सक्षम हैं। स्क्रीन रीडिंग के लिए कीबोर्ड शॉर्टकट का उपयोग करें।",
+    'pa': "ਪਹੁੰਚ ਯੋਗਤਾ ਸੁਵਿਧਾਵਾਂ ਹੁਣ ਸਮਰੱਥ ਹਨ। ਸਕਰੀਨ ਰੀਡਿੰਗ ਲਈ ਕੀਬੋਰਡ ਸ਼ਾਰਟਕੱਟ ਵਰਤੋਂ।"
+})
+
+@lru_cache(maxsize=None)
+def _get_pyautogui():
+    """Import and configure pyautogui on first use; help-only paths never load it"""
+    import pyautogui
+    pyautogui.FAILSAFE = True
+    pyautogui.PAUSE = 0.1
+    return pyautogui
+
+@lru_cache(maxsize=None)
+def _get_pyperclip():
+    """Import pyperclip on first use"""
+    import pyperclip
+    return pyperclip
+
+@lru_cache(maxsize=None)
+def _get_tesserocr():
+    """Import tesserocr (and libtesseract) on first OCR"""
+    # Keep Tesseract single-threaded per call; must be set before tesserocr is imported
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    import tesserocr
+    return tesserocr
+
+def _new_tess_api():
+    """Create a Tesseract API configured for the supported languages"""
+    tesserocr = _get_tesserocr()
+    return tesserocr.PyTessBaseAPI(lang=OCR_LANGUAGES, psm=tesserocr.PSM.AUTO,
+                                   oem=tesserocr.OEM.LSTM_ONLY)
+
+@lru_cache(maxsize=None)
+def _get_nspasteboard():
+    """Import NSPasteboard on first use; None off macOS or without pyobjc"""
+    try:
+        from AppKit import NSPasteboard
+    except ImportError:
+        return None
+    return NSPasteboard
+
+def _clipboard_change_count() -> Optional[int]:
+    """Return the OS clipboard change counter, or None where no cheap counter exists"""
+    if sys.platform == 'win32':
+        return ctypes.windll.user32.GetClipboardSequenceNumber()
+    if sys.platform == 'darwin':
+        pasteboard = _get_nspasteboard()
+        if pasteboard is not None:
+            return pasteboard.generalPasteboard().changeCount()
+    return None
+
+def _primary_selection() -> str:
+    """Return the X11/Wayland PRIMARY selection (the highlighted text) without copying"""
+    import tkinter
+    root = tkinter.Tk()
+    root.withdraw()
+    try:
+        return root.selection_get(selection='PRIMARY')
+    except tkinter.TclError:
+        # Nothing is selected
+        return ""
+    finally:
+        root.destroy()
+
+# COM objects belong to the apartment of the thread that created them
+_uia_local = threading.local()
+
+def _get_uia():
+    """Return this thread's UIAutomation client, initializing COM for the thread first (Windows only)"""
+    if getattr(_uia_local, 'client', None) is None:
+        import comtypes
+        import comtypes.client
+        # Hotkey callbacks run on the keyboard hook thread, which never initialized COM
+        comtypes.CoInitialize()
+        comtypes.client.GetModule('UIAutomationCore.dll')
+        from comtypes.gen import UIAutomationClient
+        uia = comtypes.client.CreateObject(UIAutomationClient.CUIAutomation,
+                                           interface=UIAutomationClient.IUIAutomation)
+        _uia_local.client = (uia, UIAutomationClient)
+    return _uia_local.client
+
+def _uia_selection() -> str:
+    """Return the focused control's selected text through UIAutomation's TextPattern"""
+    uia, client = _get_uia()
+    element = uia.GetFocusedElement()
+    pattern = element.GetCurrentPattern(client.UIA_TextPatternId)
+    if not pattern:
+        return ""
+    ranges = pattern.QueryInterface(client.IUIAutomationTextPattern).GetSelection()
+    if not ranges or ranges.Length == 0:
+        return ""
+    return ranges.GetElement(0).GetText(-1)
+
+def _native_selection() -> str:
+    """Read the selection through the platform API, or "" if unsupported or empty"""
+    try:
+        if sys.platform.startswith('linux'):
+            return _primary_selection()
+        if sys.platform == 'win32':
+            return _uia_selection()
+    except Exception as e:
+        logger.warning(f"Native selection unavailable, using the clipboard: {e}")
+    return ""
+
+def _set_tess_image(api, image):
+    """Hand raw RGB pixels to Tesseract; SetImage(PIL) would PNG-encode the image first"""
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width, height = image.size
+    api.SetImageBytes(image.tobytes('raw', 'RGB'), width, height, 3, 3 * width)
+
+# Live ScreenReaders whose OCR caches are saved by the single exit hook
+_ocr_cache_owners = weakref.WeakSet()
+
+def _save_ocr_caches():
+    """Merge every live reader's OCR cache and write it once at exit"""
+    merged = OrderedDict()
+    for reader in list(_ocr_cache_owners):
+        with reader._tess_lock:
+            merged.update(reader._ocr_cache)
+    if not merged:
+        return
+    entries = list(merged.items())[-OCR_CACHE_SIZE:]
+    try:
+        with open(OCR_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+    except Exception as e:
+        logger.error(f"Error saving OCR cache: {e}")
+
+atexit.register(_save_ocr_caches)
+
+# Per-process Tesseract instance used by the OCR worker pool
+_worker_tess = None
+
+def _init_tess_worker():
+    """Create one Tesseract API per pool worker process"""
+    global _worker_tess
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    _worker_tess = _new_tess_api()
+
+def _ocr_one(item: Tuple[int, object]) -> Tuple[int, str]:
+    """OCR one cropped image in a pool worker, keeping its position"""
+    index, image = item
+    _set_tess_image(_worker_tess, image)
+    return index, _worker_tess.GetUTF8Text().strip()
+
 class ScreenReader:
     """Accessibility module for screen reading functionality"""
     
-    def __init__(self, chatbot: Optional[MultilingualChatbot] = None):
+    def __init__(self, chatbot: Optional['MultilingualChatbot'] = None):
         self.config = Config()
         self.chatbot = chatbot
         self.is_reading = False
         self.reading_thread = None
+        self.clipboard_thread = None
+        self.speech_thread = None
+        self._speech_q = queue.Queue(maxsize=SPEECH_QUEUE_SIZE)
         self.stop_reading = False
-        
-        # Configure pyautogui
-        pyautogui.FAILSAFE = True
-        pyautogui.PAUSE = 0.1
+        self._stop_event = threading.Event()
+        self._clip_event = threading.Event()
+        # Held across our own copy/restore; the watcher skips the counter it leaves behind
+        self._clip_lock = threading.Lock()
+        self._own_clip_count = None
+        self._last_spoken_hash = None
+        self._tess = None
+        self._tess_lock = threading.Lock()
+        self._ocr_cache = self._load_ocr_cache()
+        self._pool = None
+        self._lang = 'en'
+        self._hotkeys = {}  # hotkey -> keyboard handle
+        _ocr_cache_owners.add(self)
         
     def read_selected_text(self, language: str = 'en') -> str:
-        """Read the currently selected text using clipboard"""
+        """Read the currently selected text, using the clipboard only as a fallback"""
+        # The selection APIs leave the user's clipboard and its listeners untouched
+        selected_text = _native_selection()
+        if selected_text:
+            logger.info(f"Read selected text: {selected_text[:100]}...")
+            return selected_text
+        
         try:
-            # Save current clipboard content
-            original_clipboard = pyperclip.paste()
-            
-            # Copy selected text
-            pyautogui.hotkey('ctrl', 'c')
-            time.sleep(0.5)  # Wait for copy operation
+            pyautogui = _get_pyautogui()
+            pyperclip = _get_pyperclip()
             
-            # Get copied text
-            selected_text = pyperclip.paste()
-            
-            # Restore original clipboard
-            pyperclip.copy(original_clipboard)
+            with self._clip_lock:
+                # Save current clipboard content
+                original_clipboard = pyperclip.paste()
+                
+                # Copy selected text
+                start_count = _clipboard_change_count()
+                pyautogui.hotkey('ctrl', 'c')
+                
+                # Wait for copy operation: return as soon as the clipboard counter moves
+                if start_count is None:
+                    time.sleep(COPY_WAIT_FALLBACK)
+                else:
+                    deadline = time.monotonic() + COPY_WAIT_TIMEOUT
+                    while _clipboard_change_count() == start_count and time.monotonic() < deadline:
+                        time.sleep(COPY_WAIT_STEP)
+                
+                # Get copied text
+                selected_text = pyperclip.paste()
+                
+                # Restore original clipboard, and tell the watcher both changes were ours
+                pyperclip.copy(original_clipboard)
+                self._own_clip_count = _clipboard_change_count()
             
             if selected_text and selected_text != original_clipboard:
                 logger.info(f"Read selected text: {selected_text[:100]}...")
@@ -55,29 +302,113 @@ class ScreenReader:
         """Read text from a specific screen region using OCR"""
         try:
             # Take screenshot of the region
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            
-            # For now, we'll use a simple approach
-            # In a real implementation, you would use OCR libraries like pytesseract
-            # or cloud OCR services
-            
-            # Placeholder for OCR functionality
-            # This would require additional dependencies like pytesseract
+            screenshot = _get_pyautogui().screenshot(region=(x, y, width, height))
             logger.info(f"Screenshot taken of region: {x}, {y}, {width}, {height}")
             
-            return "Screen region reading requires OCR setup. Please install pytesseract for full functionality."
+            # Unchanged pixels hash to the same key, so skip OCR for them
+            key = hashlib.blake2b(screenshot.tobytes(), digest_size=16).hexdigest()
+            
+            # The Tesseract API instance is not thread-safe, so serialize access to it
+            with self._tess_lock:
+                if key in self._ocr_cache:
+                    self._ocr_cache.move_to_end(key)
+                    return self._ocr_cache[key]
+                
+                if self._tess is None:
+                    self._tess = _new_tess_api()
+                _set_tess_image(self._tess, screenshot)
+                text = self._tess.GetUTF8Text().strip()
+                
+                self._ocr_cache[key] = text
+                if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+                return text
             
         except Exception as e:
             logger.error(f"Error reading screen region: {e}")
             return ""
     
-    def speak_text(self, text: str, language: str = 'en'):
+    def read_screen_regions(self, regions: List[Tuple[int, int, int, int]],
+                            language: str = 'en') -> List[str]:
+        """Read text from several (x, y, width, height) regions, OCR-ing them in parallel"""
+        try:
+            # One screenshot, cropped per region
+            screenshot = _get_pyautogui().screenshot()
+            crops = [screenshot.crop((x, y, x + width, y + height))
+                     for x, y, width, height in regions]
+            keys = [hashlib.blake2b(crop.tobytes(), digest_size=16).hexdigest()
+                    for crop in crops]
+            
+            results = [None] * len(crops)
+            with self._tess_lock:
+                for i, key in enumerate(keys):
+                    if key in self._ocr_cache:
+                        self._ocr_cache.move_to_end(key)
+                        results[i] = self._ocr_cache[key]
+            
+            misses = [(i, crops[i]) for i, text in enumerate(results) if text is None]
+            if misses:
+                if self._pool is None:
+                    self._pool = multiprocessing.Pool(
+                        processes=max(multiprocessing.cpu_count() - 1, 1),
+                        initializer=_init_tess_worker
+                    )
+                for i, text in self._pool.imap_unordered(_ocr_one, misses,
+                                                         chunksize=OCR_POOL_CHUNKSIZE):
+                    results[i] = text
+                
+                with self._tess_lock:
+                    for i, _ in misses:
+                        self._ocr_cache[keys[i]] = results[i]
+                    while len(self._ocr_cache) > OCR_CACHE_SIZE:
+                        self._ocr_cache.popitem(last=False)
+            
+            logger.info(f"Read {len(regions)} screen regions ({len(misses)} OCR'd)")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error reading screen regions: {e}")
+            return [""] * len(regions)
+    
+    def _load_ocr_cache(self) -> OrderedDict:
+        """Load OCR results saved by a previous run; the pixel hashes are stable across runs"""
+        try:
+            with open(OCR_CACHE_PATH, 'r', encoding='utf-8') as f:
+                return OrderedDict(json.load(f))
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            logger.error(f"Error loading OCR cache: {e}")
+            return OrderedDict()
+    
+    def speak_text(self, text: str, language: str = 'en', wait: bool = False):
         """Convert text to speech for accessibility"""
         if self.chatbot:
-            self.chatbot.speak_text(text)
+            self.chatbot.speak_text(text, wait=wait)
         else:
             logger.warning("Chatbot not available for text-to-speech")
     
+    def _speech_loop(self):
+        """Speak queued text until the None sentinel arrives"""
+        while True:
+            item = self._speech_q.get()
+            if item is None:
+                return
+            text, language = item
+            # Block until spoken so backlog stays in our queue, where the oldest is dropped
+            self.speak_text(text, language, wait=True)
+    
+    def _queue_speech(self, item):
+        """Queue an utterance without blocking, dropping the oldest one if full"""
+        try:
+            self._speech_q.put_nowait(item)
+        except queue.Full:
+            try:
+                self._speech_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._speech_q.put_nowait(item)
+    
     def start_continuous_reading(self, language: str = 'en', 
                                 interval: int = 5, 
                                 callback: Optional[Callable] = None):
@@ -88,43 +419,150 @@ class ScreenReader:
         
         self.is_reading = True
         self.stop_reading = False
+        self._lang = language
+        self._stop_event.clear()
+        self._clip_event.clear()
+        
+        def watch_clipboard():
+            # Signal on clipboard changes; without a change counter, wake once per interval
+            last_count = _clipboard_change_count()
+            while True:
+                if last_count is None:
+                    if self._stop_event.wait(interval):
+                        return
+                    self._clip_event.set()
+                    continue
+                
+                if self._stop_event.wait(CLIPBOARD_POLL_INTERVAL):
+                    return
+                with self._clip_lock:
+                    count = _clipboard_change_count()
+                if count != last_count:
+                    last_count = count
+                    if count != self._own_clip_count:
+                        self._clip_event.set()
         
         def reading_loop():
-            while self.is_reading and not self.stop_reading:
+            while not self._stop_event.is_set():
                 try:
-                    # Read selected text
-                    selected_text = self.read_selected_text(language)
+                    # Sleep until the clipboard changes; stop also sets the event to wake us
+                    if not self._clip_event.wait(timeout=interval):
+                        continue
+                    self._clip_event.clear()
+                    if self._stop_event.is_set():
+                        break
+                    
+                    clipboard_text = _get_pyperclip().paste()
+                    if not clipboard_text:
+                        continue
+                    
+                    # Don't re-speak (or re-report) text that was already read out
+                    text_hash = hash(clipboard_text)
+                    if text_hash == self._last_spoken_hash:
+                        continue
+                    self._last_spoken_hash = text_hash
                     
-                    if selected_text:
-                        # Speak the text
-                        self.speak_text(selected_text, language)
-                        
-                        # Call callback if provided
-                        if callback:
-                            callback(selected_text)
+                    # Hand off to the speech thread so reading isn't delayed by TTS
+                    self._queue_speech((clipboard_text, language))
                     
-                    # Wait for next reading
-                    time.sleep(interval)
+                    # Call callback if provided
+                    if callback:
+                        callback(clipboard_text)
                     
                 except Exception as e:
                     logger.error(f"Error in continuous reading: {e}")
-                    time.sleep(interval)
         
+        self.speech_thread = threading.Thread(target=self._speech_loop, daemon=True)
+        self.speech_thread.start()
+        self.clipboard_thread = threading.Thread(target=watch_clipboard, daemon=True)
+        self.clipboard_thread.start()
         self.reading_thread = threading.Thread(target=reading_loop, daemon=True)
         self.reading_thread.start()
         
         logger.info("Continuous screen reading started")
     
-    def stop_continuous_reading(self):
+    def stop_continuous_reading(self, release_hotkeys: bool = True):
         """Stop continuous screen reading"""
         self.is_reading = False
         self.stop_reading = True
+        self._stop_event.set()
+        self._clip_event.set()
         
+        # Both loops wait on the events, so they exit as soon as stop is signalled
         if self.reading_thread:
-            self.reading_thread.join(timeout=2)
+            self.reading_thread.join()
+            self.reading_thread = None
+        if self.clipboard_thread:
+            self.clipboard_thread.join()
+            self.clipboard_thread = None
+        if self.speech_thread:
+            # Discard stale queued speech so only the current utterance is finished
+            while True:
+                try:
+                    self._speech_q.get_nowait()
+                except queue.Empty:
+                    break
+            self._speech_q.put(None)
+            self.speech_thread.join()
+            self.speech_thread = None
+        
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        
+        if release_hotkeys:
+            self.release_hotkeys()
         
         logger.info("Continuous screen reading stopped")
     
+    def toggle_reading(self):
+        """Start or stop continuous reading (bound to Ctrl+Shift+R)"""
+        if self.is_reading:
+            self.stop_continuous_reading(release_hotkeys=False)
+        else:
+            self.start_continuous_reading(self._lang)
+    
+    def _speak_selected_text(self):
+        """Read the current selection aloud (bound to Ctrl+Shift+T)"""
+        text = self.read_selected_text(self._lang)
+        if text:
+            self.speak_text(text, self._lang)
+    
+    def register_hotkeys(self):
+        """Bind the accessibility shortcuts once through the keyboard library's hotkey table"""
+        if self._hotkeys:
+            return
+        try:
+            import keyboard
+        except ImportError:
+            logger.warning("keyboard not installed; accessibility shortcuts are not bound")
+            return
+        
+        bindings = {
+            'ctrl+shift+r': self.toggle_reading,
+            'ctrl+shift+t': self._speak_selected_text,
+            'ctrl+shift+h': lambda: self.speak_text(self.get_help_information(self._lang), self._lang),
+        }
+        try:
+            for hotkey, action in bindings.items():
+                self._hotkeys[hotkey] = keyboard.add_hotkey(hotkey, action)
+        except Exception as e:
+            # Linux needs root to hook the keyboard
+            logger.error(f"Error registering accessibility shortcuts: {e}")
+    
+    def release_hotkeys(self):
+        """Unbind shortcuts registered by register_hotkeys"""
+        if not self._hotkeys:
+            return
+        import keyboard
+        for handle in self._hotkeys.values():
+            try:
+                keyboard.remove_hotkey(handle)
+            except (KeyError, ValueError):
+                pass
+        self._hotkeys = {}
+    
     def read_webpage_content(self, url: str = None, language: str = 'en') -> str:
         """Read content from a webpage"""
         try:
@@ -167,75 +605,31 @@ class ScreenReader:
     
     def accessibility_shortcuts(self):
         """Define accessibility keyboard shortcuts"""
-        shortcuts = {
-            "Ctrl+Shift+R": "Start/Stop screen reading",
-            "Ctrl+Shift+T": "Read selected text",
-            "Ctrl+Shift+S": "Speak current screen",
-            "Ctrl+Shift+H": "Read help information",
-            "Ctrl+Shift+L": "Change language",
-            "Ctrl+Shift+P": "Read preferences"
-        }
-        
-        return shortcuts
+        return _SHORTCUTS
     
     def get_help_information(self, language: str = 'en') -> str:
         """Get help information for accessibility features"""
-        help_text = {
-            'en': """
-            PGRKAM Digital Assistant - Accessibility Features:
-            
-            1. Screen Reading: Use Ctrl+Shift+R to start/stop continuous screen reading
-            2. Text Selection: Use Ctrl+Shift+T to read currently selected text
-            3. Voice Input: Use the voice input feature for hands-free interaction
-            4. Language Support: Switch between English, Hindi, and Punjabi
-            5. Keyboard Navigation: Use Tab and arrow keys to navigate
-            
-            For more help, contact support@pgrkam.gov.in
-            """,
-            'hi': """
-            PGRKAM डिजिटल असिस्टेंट - पहुंच योग्यता सुविधाएं:
-            
-            1. स्क्रीन रीडिंग: निरंतर स्क्रीन रीडिंग शुरू/बंद करने के लिए Ctrl+Shift+R का उपयोग करें
-            2. टेक्स्ट चयन: वर्तमान में चयनित टेक्स्ट पढ़ने के लिए Ctrl+Shift+T का उपयोग करें
-            3. वॉयस इनपुट: हाथ मुक्त बातचीत के लिए वॉयस इनपुट सुविधा का उपयोग करें
-            4. भाषा समर्थन: अंग्रेजी, हिंदी और पंजाबी के बीच स्विच करें
-            5. कीबोर्ड नेविगेशन: नेविगेट करने के लिए Tab और एरो की का उपयोग करें
-            
-            अधिक सहायता के लिए support@pgrkam.gov.in पर संपर्क करें
-            """,
-            'pa': """
-            PGRKAM ਡਿਜੀਟਲ ਅਸਿਸਟੈਂਟ - ਪਹੁੰਚ ਯੋਗਤਾ ਸੁਵਿਧਾਵਾਂ:
-            
-            1. ਸਕਰੀਨ ਰੀਡਿੰਗ: ਲਗਾਤਾਰ ਸਕਰੀਨ ਰੀਡਿੰਗ ਸ਼ੁਰੂ/ਬੰਦ ਕਰਨ ਲਈ Ctrl+Shift+R ਵਰਤੋਂ
-            2. ਟੈਕਸਟ ਚੋਣ: ਮੌਜੂਦਾ ਚੁਣੇ ਗਏ ਟੈਕਸਟ ਪੜ੍ਹਨ ਲਈ Ctrl+Shift+T ਵਰਤੋਂ
-            3. ਵੌਇਸ ਇਨਪੁਟ: ਹੱਥ-ਮੁਕਤ ਗੱਲਬਾਤ ਲਈ ਵੌਇਸ ਇਨਪੁਟ ਸੁਵਿਧਾ ਵਰਤੋਂ
-            4. ਭਾਸ਼ਾ ਸਹਾਇਤਾ: ਅੰਗਰੇਜ਼ੀ, ਹਿੰਦੀ ਅਤੇ ਪੰਜਾਬੀ ਵਿਚਕਾਰ ਬਦਲੋ
-            5. ਕੀਬੋਰਡ ਨੈਵੀਗੇਸ਼ਨ: ਨੈਵੀਗੇਟ ਕਰਨ ਲਈ Tab ਅਤੇ ਐਰੋ ਕੀਜ਼ ਵਰਤੋਂ
-            
-            ਹੋਰ ਸਹਾਇਤਾ ਲਈ support@pgrkam.gov.in 'ਤੇ ਸੰਪਰਕ ਕਰੋ
-            """
-        }
-        
-        return help_text.get(language, help_text['en'])
+        return _HELP_TEXT.get(language, _HELP_TEXT['en'])
     
     def setup_accessibility_features(self, language: str = 'en'):
         """Setup accessibility features for the user"""
         try:
             # Speak welcome message
-            welcome_message = {
-                'en': "Accessibility features are now enabled. Use keyboard shortcuts for screen reading.",
-                'hi': "पहुंच योग्यता सुविधाएं अब सक्षम हैं। स्क्रीन रीडिंग के लिए कीबोर्ड शॉर्टकट का उपयोग करें।",
-                'pa': "ਪਹੁੰਚ ਯੋਗਤਾ ਸੁਵਿਧਾਵਾਂ ਹੁਣ ਸਮਰੱਥ ਹਨ। ਸਕਰੀਨ ਰੀਡਿੰਗ ਲਈ ਕੀਬੋਰਡ ਸ਼ਾਰਟਕੱਟ ਵਰਤੋਂ।"
-            }
-            
-            message = welcome_message.get(language, welcome_message['en'])
+            message = _WELCOME_MESSAGES.get(language, _WELCOME_MESSAGES['en'])
             self.speak_text(message, language)
             
-            # Display shortcuts
+            # Bind the shortcuts so they work without a key-listener loop
+            self._lang = language
+            self.register_hotkeys()
+            
+            # Display shortcuts, marking any that are not bound on this system
             shortcuts = self.accessibility_shortcuts()
             print("\nAccessibility Shortcuts:")
             for shortcut, description in shortcuts.items():
-                print(f"{shortcut}: {description}")
+                if shortcut.lower() in self._hotkeys:
+                    print(f"{shortcut}: {description}")
+                else:
+                    print(f"{shortcut}: {description} (not available)")
             
             logger.info("Accessibility features setup completed")
             
@@ -249,7 +643,7 @@ class AccessibilityManager:
         self.screen_reader = None
         self.chatbot = None
         
-    def initialize(self, chatbot: MultilingualChatbot):
+    def initialize(self, chatbot: 'MultilingualChatbot'):
         """Initialize accessibility manager with chatbot"""
         self.chatbot = chatbot
         self.screen_reader = ScreenReader(chatbot)
@@ -295,6 +689,8 @@ if __name__ == "__main__":
     
     # Initialize chatbot and accessibility manager
     try:
+        from multilingual_chatbot import MultilingualChatbot
+        
         chatbot = MultilingualChatbot()
         accessibility = AccessibilityManager()
         accessibility.initialize(chatbot)
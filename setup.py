@@ -6,15 +6,39 @@ This script helps users set up the chatbot system quickly and easily.
 
 import os
 import sys
+import argparse
+import shutil
+import sqlite3
 import subprocess
 import platform
+import importlib.util
 import json
+import threading
+import time
+import urllib.request
 from pathlib import Path
 
+# Browser executables (or .app bundles on macOS) to look for, per platform
+BROWSER_CANDIDATES = {
+    'windows': ['chrome.exe', 'msedge.exe', 'firefox.exe'],
+    'darwin': ['Google Chrome.app', 'Firefox.app', 'Safari.app'],
+    'linux': ['google-chrome', 'chromium', 'firefox'],
+}
+
+# Modules the installation test checks for
+REQUIRED_MODULES = ['streamlit', 'openai', 'pinecone', 'googletrans', 'speech_recognition', 'pyttsx3']
+
+# Abort pip if it prints nothing for this many seconds
+PIP_STALL_TIMEOUT = 600
+
+# fastText language-identification model used by MultilingualChatbot.detect_language
+LID_MODEL_URL = 'https://dl.fbaipublicfiles.com/fasttext/supported-models/lid.176.bin'
+
 class SetupManager:
     """Manages the setup process for the PGRKAM chatbot"""
     
-    def __init__(self):
+    def __init__(self, test_network: bool = False):
+        self.test_network = test_network
         self.project_dir = Path(__file__).parent
         self.requirements_file = self.project_dir / "requirement.txt"
         self.config_file = self.project_dir / "config.py"
@@ -49,52 +73,25 @@ class SetupManager:
             print("   Install pyaudio: pip install pyaudio")
         
         # Check for browser support
-        browsers = ['chrome', 'firefox', 'safari', 'edge']
-        browser_found = False
-        for browser in browsers:
-            if self.check_browser(browser):
-                browser_found = True
-                break
-        
-        if browser_found:
+        if self.check_browser():
             print("✅ Web browser detected")
         else:
             print("⚠️  No web browser detected - web interface may not work properly")
         
         return True
     
-    def check_browser(self, browser_name):
-        """Check if a specific browser is installed"""
+    def check_browser(self):
+        """Check if any supported browser is installed"""
         system = platform.system().lower()
         
-        if system == "windows":
-            browsers = {
-                'chrome': ['chrome.exe', 'google chrome'],
-                'firefox': ['firefox.exe'],
-                'edge': ['msedge.exe', 'microsoft edge']
-            }
-        elif system == "darwin":  # macOS
-            browsers = {
-                'chrome': ['Google Chrome.app'],
-                'firefox': ['Firefox.app'],
-                'safari': ['Safari.app']
-            }
-        else:  # Linux
-            browsers = {
-                'chrome': ['google-chrome', 'chromium'],
-                'firefox': ['firefox']
-            }
-        
-        if browser_name in browsers:
-            for browser in browsers[browser_name]:
-                try:
-                    subprocess.run(['which', browser], 
-                                 capture_output=True, check=True)
-                    return True
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    continue
+        if system == "darwin":  # macOS
+            app_dirs = [Path("/Applications"), Path.home() / "Applications"]
+            return any((app_dir / app).is_dir()
+                       for app in BROWSER_CANDIDATES[system] for app_dir in app_dirs)
         
-        return False
+        # shutil.which honours PATHEXT on Windows, so .exe names resolve directly
+        candidates = BROWSER_CANDIDATES.get(system, BROWSER_CANDIDATES['linux'])
+        return any(shutil.which(browser) for browser in candidates)
     
     def install_dependencies(self):
         """Install required Python packages"""
@@ -104,22 +101,55 @@ class SetupManager:
             print("❌ Error: requirements.txt not found")
             return False
         
+        # Upgrade pip and install requirements in a single resolver pass,
+        # streaming pip's output as it arrives instead of after it exits
+        env = dict(os.environ, PIP_DISABLE_PIP_VERSION_CHECK='1', PYTHONUNBUFFERED='1')
         try:
-            # Upgrade pip first
-            subprocess.run([sys.executable, '-m', 'pip', 'install', '--upgrade', 'pip'], 
-                         check=True, capture_output=True)
-            
-            # Install requirements
-            subprocess.run([sys.executable, '-m', 'pip', 'install', '-r', 
-                          str(self.requirements_file)], check=True)
-            
-            print("✅ Dependencies installed successfully")
-            return True
-            
-        except subprocess.CalledProcessError as e:
+            proc = subprocess.Popen([sys.executable, '-m', 'pip', 'install', '--upgrade',
+                                   '--prefer-binary', '--disable-pip-version-check', '--no-input',
+                                   '--progress-bar', 'off',
+                                   '-r', str(self.requirements_file), 'pip'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                  text=True, bufsize=1, env=env)
+        except OSError as e:
             print(f"❌ Error installing dependencies: {e}")
             print("   Try running: pip install -r requirement.txt")
             return False
+        
+        last_output = time.monotonic()
+        stalled = threading.Event()
+        
+        def watchdog():
+            while proc.poll() is None:
+                if time.monotonic() - last_output > PIP_STALL_TIMEOUT:
+                    stalled.set()
+                    proc.kill()
+                    return
+                time.sleep(1)
+        
+        threading.Thread(target=watchdog, daemon=True).start()
+        
+        errors = []
+        for line in proc.stdout:
+            last_output = time.monotonic()
+            if 'error' in line.lower():
+                errors.append(line.rstrip())
+                print(f"   ❌ {line}", end='')
+            else:
+                print(f"   {line}", end='')
+        
+        if proc.wait() == 0:
+            print("✅ Dependencies installed successfully")
+            return True
+        
+        if stalled.is_set():
+            print(f"❌ pip produced no output for {PIP_STALL_TIMEOUT}s and was stopped")
+        else:
+            print(f"❌ Error installing dependencies (pip exited with code {proc.returncode})")
+            for line in errors[-5:]:
+                print(f"   {line}")
+        print("   Try running: pip install -r requirement.txt")
+        return False
     
     def setup_environment(self):
         """Set up environment variables"""
@@ -184,10 +214,18 @@ PREFERENCE_WEIGHT=0.7
         print("\n🗄️  Setting up database...")
         
         try:
-            from multilingual_chatbot import MultilingualChatbot
+            # Only the schema is needed here; the chatbot itself loads models and API clients
+            from config import SCHEMA_SQL
+            
+            conn = sqlite3.connect(self.project_dir / "chatbot.db")
+            try:
+                # WAL is persistent, so later opens by the chatbot start in WAL mode
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(SCHEMA_SQL)
+            finally:
+                conn.close()
             
-            # Initialize chatbot to create database
-            chatbot = MultilingualChatbot()
             print("✅ Database initialized successfully")
             return True
             
@@ -196,6 +234,30 @@ PREFERENCE_WEIGHT=0.7
             print("   Database will be created when you first run the application")
             return False
     
+    def download_language_model(self):
+        """Download the fastText language-identification model"""
+        print("\n🌐 Downloading language-identification model...")
+        
+        from config import Config
+        model_path = self.project_dir / Config.LID_MODEL_PATH
+        if model_path.exists():
+            print("✅ Language model already present")
+            return True
+        
+        # Download beside the target so an interrupted transfer never looks complete
+        partial = model_path.with_name(model_path.name + '.part')
+        try:
+            urllib.request.urlretrieve(LID_MODEL_URL, partial)
+            os.replace(partial, model_path)
+            print("✅ Language model downloaded")
+            return True
+        except Exception as e:
+            partial.unlink(missing_ok=True)
+            print(f"❌ Error downloading language model: {e}")
+            print(f"   Download it manually from {LID_MODEL_URL}")
+            print("   Language detection will fall back to langdetect")
+            return False
+    
     def create_sample_documents(self):
         """Create sample documents for testing"""
         print("\n📄 Creating sample documents...")
@@ -239,19 +301,20 @@ PREFERENCE_WEIGHT=0.7
         print("\n🧪 Testing installation...")
         
         try:
-            # Test imports
-            import streamlit
-            import openai
-            import pinecone
-            from googletrans import Translator
-            import speech_recognition as sr
-            import pyttsx3
+            # Check modules are installed without importing them
+            missing = [name for name in REQUIRED_MODULES
+                       if importlib.util.find_spec(name) is None]
+            if missing:
+                print(f"❌ Missing modules: {', '.join(missing)}")
+                return False
             
-            print("✅ All required modules imported successfully")
+            print("✅ All required modules found")
             
-            # Test basic functionality
-            translator = Translator()
-            print("✅ Translation service working")
+            # Only talk to the translation service when explicitly asked to
+            if self.test_network:
+                from googletrans import Translator
+                Translator().translate("hello", dest="hi")
+                print("✅ Translation service working")
             
             print("✅ Installation test passed")
             return True
@@ -290,6 +353,7 @@ PREFERENCE_WEIGHT=0.7
             ("Installing dependencies", self.install_dependencies),
             ("Setting up environment", self.setup_environment),
             ("Setting up database", self.setup_database),
+            ("Downloading language model", self.download_language_model),
             ("Creating sample documents", self.create_sample_documents),
             ("Testing installation", self.test_installation),
         ]
@@ -319,7 +383,12 @@ PREFERENCE_WEIGHT=0.7
 
 def main():
     """Main setup function"""
-    setup_manager = SetupManager()
+    parser = argparse.ArgumentParser(description="Set up the PGRKAM Digital Assistant")
+    parser.add_argument('--test-network', action='store_true',
+                        help="also check that the translation service is reachable")
+    args = parser.parse_args()
+    
+    setup_manager = SetupManager(test_network=args.test_network)
     success = setup_manager.run_setup()
     
     if success:
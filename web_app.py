@@ -1,14 +1,28 @@
+import os
 import streamlit as st
 import uuid
-import json
+import orjson
 from datetime import datetime
 import time
 import io
 import base64
+from collections import deque
+from itertools import islice
 
-from gemini_chatbot import GeminiChatbot
 from config import Config
 
+def __getattr__(name):
+    """Import GeminiChatbot (and its model/client deps) only when first needed"""
+    if name == "GeminiChatbot":
+        from gemini_chatbot import GeminiChatbot
+        globals()[name] = GeminiChatbot
+        return GeminiChatbot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Resolve the chatbot import at load time instead, e.g. so CI fails fast on a broken import
+if os.getenv('PGRKAM_EAGER_IMPORT') == '1':
+    from gemini_chatbot import GeminiChatbot
+
 # Page configuration
 st.set_page_config(
     page_title="PGRKAM Digital Assistant",
@@ -17,8 +31,26 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Oldest messages are dropped once a session's history reaches this length
+CHAT_HISTORY_LIMIT = 200
+
+_LANG_NAMES = {'en': 'English', 'hi': 'हिंदी', 'pa': 'ਪੰਜਾਬੀ'}
+
+_CATEGORIES = ('Any', 'Government Jobs', 'Private Sector', 'Skill Development',
+               'Foreign Counseling', 'Education', 'Healthcare', 'Technology')
+
+_EXPERIENCE_LEVELS = ('Any', 'Entry Level (0-2 years)', 'Mid Level (2-5 years)',
+                      'Senior Level (5+ years)')
+
+# (button label, prompt sent to the chatbot)
+_QUICK_ACTIONS = (
+    ("🔍 Find Jobs", "Show me available jobs"),
+    ("🎓 Skill Development", "Tell me about skill development programs"),
+    ("🌍 Foreign Counseling", "Tell me about foreign counseling services"),
+)
+
 # Custom CSS for better UI
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         background: linear-gradient(90deg, #1e3c72 0%, #2a5298 100%);
@@ -29,23 +61,6 @@ st.markdown("""
         margin-bottom: 2rem;
     }
     
-    .chat-message {
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-        border-left: 4px solid #1e3c72;
-    }
-    
-    .user-message {
-        background-color: #e3f2fd;
-        margin-left: 20%;
-    }
-    
-    .bot-message {
-        background-color: #f5f5f5;
-        margin-right: 20%;
-    }
-    
     .language-selector {
         background-color: #f8f9fa;
         padding: 1rem;
@@ -76,7 +91,19 @@ st.markdown("""
         border-radius: 8px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def inject_css():
+    """Emit the custom CSS"""
+    # Streamlit drops elements a rerun doesn't re-emit, so this must run every rerun
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+@st.cache_resource
+def get_chatbot():
+    """Build the chatbot once per process; every session and rerun shares it"""
+    # Imported here so loading the page doesn't pull in the Gemini SDK until it is needed
+    from gemini_chatbot import GeminiChatbot
+    return GeminiChatbot()
 
 def initialize_session_state():
     """Initialize session state variables"""
@@ -84,14 +111,14 @@ def initialize_session_state():
         st.session_state.session_id = str(uuid.uuid4())
     
     if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = deque(maxlen=CHAT_HISTORY_LIMIT)
     
     if 'selected_language' not in st.session_state:
         st.session_state.selected_language = 'en'
     
     if 'chatbot' not in st.session_state:
         try:
-            st.session_state.chatbot = GeminiChatbot()
+            st.session_state.chatbot = get_chatbot()
         except Exception as e:
             st.error(f"Failed to initialize chatbot: {e}")
             st.session_state.chatbot = None
@@ -134,8 +161,7 @@ def display_language_selector():
             st.session_state.selected_language = 'pa'
     
     current_lang = st.session_state.selected_language
-    lang_names = {'en': 'English', 'hi': 'हिंदी', 'pa': 'ਪੰਜਾਬੀ'}
-    st.info(f"Current Language: {lang_names[current_lang]}")
+    st.info(f"Current Language: {_LANG_NAMES[current_lang]}")
     st.markdown('</div>', unsafe_allow_html=True)
 
 def display_user_preferences():
@@ -144,13 +170,10 @@ def display_user_preferences():
     st.subheader("⚙️ Your Preferences")
     
     # Job Category Preference
-    categories = ['Any', 'Government Jobs', 'Private Sector', 'Skill Development', 
-                 'Foreign Counseling', 'Education', 'Healthcare', 'Technology']
-    
     selected_category = st.selectbox(
         "Preferred Job Category",
-        categories,
-        index=categories.index(st.session_state.user_preferences.get('preferred_category', 'Any'))
+        _CATEGORIES,
+        index=_CATEGORIES.index(st.session_state.user_preferences.get('preferred_category') or 'Any')
     )
     
     if selected_category != 'Any':
@@ -159,13 +182,10 @@ def display_user_preferences():
         st.session_state.user_preferences['preferred_category'] = None
     
     # Experience Level
-    experience_levels = ['Any', 'Entry Level (0-2 years)', 'Mid Level (2-5 years)', 
-                        'Senior Level (5+ years)']
-    
     selected_experience = st.selectbox(
         "Experience Level",
-        experience_levels,
-        index=experience_levels.index(st.session_state.user_preferences.get('experience_level', 'Any'))
+        _EXPERIENCE_LEVELS,
+        index=_EXPERIENCE_LEVELS.index(st.session_state.user_preferences.get('experience_level') or 'Any')
     )
     
     if selected_experience != 'Any':
@@ -189,6 +209,23 @@ def display_user_preferences():
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def _log_turn(user_text, result, ts=None):
+    """Append a user message and the chatbot's reply to the chat history"""
+    ts = ts or time.strftime("%H:%M:%S")
+    history = st.session_state.chat_history
+    history.append({
+        'type': 'user',
+        'content': user_text,
+        'language': st.session_state.selected_language,
+        'timestamp': ts
+    })
+    history.append({
+        'type': 'bot',
+        'content': result['response'],
+        'language': result['language'],
+        'timestamp': ts
+    })
+
 def display_chat_interface():
     """Display the main chat interface"""
     st.subheader("💬 Chat with PGRKAM Assistant")
@@ -203,11 +240,10 @@ def display_chat_interface():
     user_input = ""
     
     if input_method == "Text Input":
-        user_input = st.text_area(
-            "Type your question here:",
-            placeholder="Ask about jobs, skill development, or foreign counseling...",
-            height=100
-        )
+        # Returns the message once, on the rerun where the user submits it
+        user_input = st.chat_input(
+            "Ask about jobs, skill development, or foreign counseling..."
+        ) or ""
     else:
         st.markdown("### 🎤 Voice Input")
         if st.button("🎤 Start Recording", key="voice_btn"):
@@ -220,129 +256,56 @@ def display_chat_interface():
                         st.success(f"Voice input: {user_input}")
                     else:
                         st.error("Voice recognition failed. Please try again.")
-    
-    # Process input
-    if st.button("🚀 Send", disabled=not user_input.strip()):
-        if st.session_state.chatbot and user_input.strip():
-            with st.spinner("Processing your request..."):
-                # Process the query
-                result = st.session_state.chatbot.process_query(
-                    user_input,
-                    st.session_state.session_id,
-                    st.session_state.selected_language,
-                    'voice' if input_method == "Voice Input" else 'text'
-                )
-                
-                # Add to chat history
-                st.session_state.chat_history.append({
-                    'type': 'user',
-                    'content': user_input,
-                    'language': st.session_state.selected_language,
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-                
-                st.session_state.chat_history.append({
-                    'type': 'bot',
-                    'content': result['response'],
-                    'language': result['language'],
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-                
-                # Speak the response
-                if input_method == "Voice Input":
-                    st.session_state.chatbot.speak_text(result['response'])
+                        user_input = ""
+    
+    # Process input as soon as it arrives
+    if st.session_state.chatbot and user_input.strip():
+        with st.spinner("Processing your request..."):
+            # Process the query
+            result = st.session_state.chatbot.process_query(
+                user_input,
+                st.session_state.session_id,
+                st.session_state.selected_language,
+                'voice' if input_method == "Voice Input" else 'text'
+            )
+            
+            # Add to chat history
+            _log_turn(user_input, result)
+            
+            # Speak the response
+            if input_method == "Voice Input":
+                st.session_state.chatbot.speak_text(result['response'])
 
 def display_chat_history():
     """Display chat history"""
     if st.session_state.chat_history:
         st.subheader("📜 Chat History")
         
-        for message in reversed(st.session_state.chat_history[-10:]):  # Show last 10 messages
-            if message['type'] == 'user':
-                st.markdown(f"""
-                <div class="chat-message user-message">
-                    <strong>You ({message['timestamp']}):</strong><br>
-                    {message['content']}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="chat-message bot-message">
-                    <strong>Assistant ({message['timestamp']}):</strong><br>
-                    {message['content']}
-                </div>
-                """, unsafe_allow_html=True)
+        # Show last 10 messages, oldest first as in a chat transcript
+        recent = list(islice(reversed(st.session_state.chat_history), 10))
+        for message in reversed(recent):
+            with st.chat_message("user" if message['type'] == 'user' else "assistant"):
+                st.markdown(f"**{message['timestamp']}**  \n{message['content']}")
     else:
         st.info("No chat history yet. Start a conversation!")
 
+def _submit(prompt):
+    """Send a prompt to the chatbot and record the turn in the chat history"""
+    result = st.session_state.chatbot.process_query(
+        prompt,
+        st.session_state.session_id,
+        st.session_state.selected_language
+    )
+    _log_turn(prompt, result)
+
 def display_quick_actions():
     """Display quick action buttons"""
     st.subheader("⚡ Quick Actions")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("🔍 Find Jobs"):
-            if st.session_state.chatbot:
-                result = st.session_state.chatbot.process_query(
-                    "Show me available jobs",
-                    st.session_state.session_id,
-                    st.session_state.selected_language
-                )
-                st.session_state.chat_history.append({
-                    'type': 'user',
-                    'content': 'Show me available jobs',
-                    'language': st.session_state.selected_language,
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-                st.session_state.chat_history.append({
-                    'type': 'bot',
-                    'content': result['response'],
-                    'language': result['language'],
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-    
-    with col2:
-        if st.button("🎓 Skill Development"):
-            if st.session_state.chatbot:
-                result = st.session_state.chatbot.process_query(
-                    "Tell me about skill development programs",
-                    st.session_state.session_id,
-                    st.session_state.selected_language
-                )
-                st.session_state.chat_history.append({
-                    'type': 'user',
-                    'content': 'Tell me about skill development programs',
-                    'language': st.session_state.selected_language,
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-                st.session_state.chat_history.append({
-                    'type': 'bot',
-                    'content': result['response'],
-                    'language': result['language'],
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-    
-    with col3:
-        if st.button("🌍 Foreign Counseling"):
-            if st.session_state.chatbot:
-                result = st.session_state.chatbot.process_query(
-                    "Tell me about foreign counseling services",
-                    st.session_state.session_id,
-                    st.session_state.selected_language
-                )
-                st.session_state.chat_history.append({
-                    'type': 'user',
-                    'content': 'Tell me about foreign counseling services',
-                    'language': st.session_state.selected_language,
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
-                st.session_state.chat_history.append({
-                    'type': 'bot',
-                    'content': result['response'],
-                    'language': result['language'],
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                })
+    for (label, prompt), col in zip(_QUICK_ACTIONS, st.columns(len(_QUICK_ACTIONS))):
+        with col:
+            if st.button(label) and st.session_state.chatbot:
+                _submit(prompt)
 
 def display_footer():
     """Display footer information"""
@@ -358,6 +321,7 @@ def display_footer():
 def main():
     """Main application function"""
     initialize_session_state()
+    inject_css()
     
     # Display header
     display_header()
@@ -391,23 +355,25 @@ def main():
         
         # Clear chat button
         if st.button("🗑️ Clear Chat"):
-            st.session_state.chat_history = []
+            st.session_state.chat_history.clear()
             st.success("Chat history cleared!")
         
         # Export chat button
         if st.button("📥 Export Chat"):
             if st.session_state.chat_history:
+                now = datetime.now()
                 chat_data = {
                     'session_id': st.session_state.session_id,
-                    'exported_at': datetime.now().isoformat(),
-                    'chat_history': st.session_state.chat_history
+                    'exported_at': now.isoformat(),
+                    'chat_history': list(st.session_state.chat_history)
                 }
                 
-                json_str = json.dumps(chat_data, indent=2, ensure_ascii=False)
+                # orjson writes UTF-8 bytes directly, keeping Hindi/Punjabi text unescaped
+                json_bytes = orjson.dumps(chat_data, option=orjson.OPT_INDENT_2)
                 st.download_button(
                     label="Download Chat History",
-                    data=json_str,
-                    file_name=f"pgrkam_chat_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                    data=json_bytes,
+                    file_name=f"pgrkam_chat_{now.strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
             else: